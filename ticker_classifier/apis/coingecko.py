@@ -1,35 +1,273 @@
-from collections import defaultdict
+import asyncio
+import json
+import logging
+import sqlite3
+import sys
+import time
 from typing import Dict, List
 
 import aiohttp
+import orjson
 import requests
 
+logger = logging.getLogger(__name__)
+
+# Concurrent in-flight price chunks; kept below CoinGecko's free-tier
+# rate limit while still collapsing the serial chunk loop to ~max(t_chunk).
+_MAX_CONCURRENT_CHUNKS = 6
+
+# /coins/markets pages pulled at map-load time to learn which ids actually
+# rank by market cap: 8 pages x 250 rows = top 2000 coins. Kept small so a
+# cold load (these pages plus /coins/list) stays under CoinGecko's
+# free-tier rate limit.
+_TOP_IDS_PAGES = 8
+_TOP_IDS_PER_PAGE = 250
+
+# After a failed coin-list download, skip re-fetching for this long; a broken
+# upstream would otherwise be retried on every single classify call.
+_FAIL_COOLDOWN_SECONDS = 30.0
+
 
 class CoinGeckoClient:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_db: str = "coingecko_cache.db",
+        map_hours_to_expire: int = 24,
+        price_minutes_to_expire: int = 10,
+        session: requests.Session = None,
+    ):
         """Initialize CoinGecko client.
 
         Sets up base endpoints used for retrieving the coin list and simple
         price information and initializes an internal cache for symbol -> id
         mappings.
 
+        Parameters
+        ----------
+        cache_db : str, optional
+            SQLite filename used to persist the symbol -> id map between
+            processes, by default "coingecko_cache.db".
+        map_hours_to_expire : int, optional
+            Hours after which the persisted map is considered stale and the
+            coin list is re-fetched, by default 24.
+        price_minutes_to_expire : int, optional
+            Minutes for which fetched per-id market caps stay reusable from
+            the on-disk price cache, by default 10.
+        session : requests.Session, optional
+            Shared session for synchronous requests, so repeat calls reuse
+            pooled TCP/TLS connections. A private session is created when
+            omitted.
+
         Notes
         -----
         The client keeps an in-memory `_crypto_map` that maps uppercase
         symbols to a list of CoinGecko ids. This map is populated lazily by
         `_load_map_sync` or `_load_map_async` when price lookup is requested.
+        The `/coins/list` endpoint returns 10k+ rows and dominates cold-start
+        latency, so the built map is persisted to `cache_db` with a TTL and
+        fresh processes load it locally instead of re-downloading.
         """
         self.list_url = "https://api.coingecko.com/api/v3/coins/list"
         self.price_url = "https://api.coingecko.com/api/v3/simple/price"
+        self.markets_url = "https://api.coingecko.com/api/v3/coins/markets"
+        self.cache_db = cache_db
+        self.map_hours_to_expire = map_hours_to_expire
+        self.price_minutes_to_expire = price_minutes_to_expire
+        self._session = session or requests.Session()
+        self._fail_until = 0.0
         self._crypto_map = None  # { 'BTC': ['bitcoin', 'bitcoin-token'], ... }
 
+    @staticmethod
+    def _build_map(data) -> Dict[str, List[str]]:
+        """Build the symbol -> ids map from a /coins/list payload.
+
+        Parameters
+        ----------
+        data : list[dict]
+            Decoded /coins/list rows with `symbol` and `id` keys.
+
+        Returns
+        -------
+        dict[str, list[str]]
+            Mapping of uppercase symbol -> CoinGecko ids. Keys are interned:
+            the map lives for the process lifetime and every price lookup
+            hashes these same short strings, so pointer-equality comparisons
+            pay off and duplicate key storage is avoided.
+        """
+        m = {}
+        get = m.get
+        intern = sys.intern
+        for coin in data:
+            k = intern(coin["symbol"].upper())
+            ids = get(k)
+            if ids is None:
+                m[k] = [coin["id"]]
+            else:
+                ids.append(coin["id"])
+        return m
+
+    def _filter_map_to_top_ids(self, top_ids):
+        """Drop unranked collision ids from the in-memory map.
+
+        Most of the 10 ids a popular symbol can collide with are dead or
+        dust coins that never report a market cap; keeping only ids ranked
+        in the /coins/markets top pages shrinks the candidate fan-out (and
+        with it the number of price chunks) roughly tenfold. Symbols with
+        no ranked id keep their first listed id as a fallback.
+
+        Parameters
+        ----------
+        top_ids : set[str] or None
+            CoinGecko ids ranked within the top market-cap pages. None or
+            empty (the ranking fetch failed or was incomplete) leaves the
+            map unfiltered — filtering against a partial ranking would
+            wrongly demote legitimately ranked ids.
+        """
+        if not top_ids or not self._crypto_map:
+            return
+        self._crypto_map = {
+            sym: [cid for cid in ids if cid in top_ids] or ids[:1]
+            for sym, ids in self._crypto_map.items()
+        }
+
+    def _fetch_top_ids_sync(self):
+        """Collect ids from the top /coins/markets pages synchronously.
+
+        Returns
+        -------
+        set[str] or None
+            Ids of the top-ranked coins when every page was fetched, or
+            None when a page failed mid-run (e.g. a rate limit): a partial
+            ranking must not be used for filtering.
+        """
+        top_ids = set()
+        try:
+            for page in range(1, _TOP_IDS_PAGES + 1):
+                resp = self._session.get(
+                    self.markets_url,
+                    params={
+                        "vs_currency": "usd",
+                        "order": "market_cap_desc",
+                        "per_page": _TOP_IDS_PER_PAGE,
+                        "page": page,
+                        "sparkline": "false",
+                    },
+                    timeout=10,
+                )
+                rows = orjson.loads(resp.content)
+                if not rows:
+                    break
+                top_ids.update(row["id"] for row in rows)
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            logger.warning("CoinGecko markets ranking fetch failed: %s", e)
+            return None
+        return top_ids
+
+    async def _fetch_top_ids_async(self, session: aiohttp.ClientSession):
+        """Collect ids from the top /coins/markets pages concurrently.
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            Active aiohttp session used for the page requests.
+
+        Returns
+        -------
+        set[str] or None
+            Ids of the top-ranked coins when every page was fetched, or
+            None when any page failed (e.g. a rate limit): a partial
+            ranking must not be used for filtering.
+        """
+        top_ids = set()
+        sem = asyncio.Semaphore(_MAX_CONCURRENT_CHUNKS)
+
+        async def fetch_page(page):
+            params = {
+                "vs_currency": "usd",
+                "order": "market_cap_desc",
+                "per_page": _TOP_IDS_PER_PAGE,
+                "page": page,
+                "sparkline": "false",
+            }
+            try:
+                async with sem:
+                    async with session.get(self.markets_url, params=params) as resp:
+                        rows = orjson.loads(await resp.read())
+                top_ids.update(row["id"] for row in rows)
+                return True
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                ValueError,
+                KeyError,
+                TypeError,
+            ) as e:
+                logger.warning("CoinGecko markets ranking fetch failed: %s", e)
+                return False
+
+        complete = await asyncio.gather(
+            *(fetch_page(page) for page in range(1, _TOP_IDS_PAGES + 1))
+        )
+        if not all(complete):
+            return None
+        return top_ids
+
+    def _load_map_from_disk(self) -> bool:
+        """Try to populate `_crypto_map` from the on-disk cache.
+
+        Returns
+        -------
+        bool
+            True if a fresh map was loaded, False if the cache is missing,
+            stale or unreadable.
+        """
+        cutoff = int(time.time()) - self.map_hours_to_expire * 3600
+        try:
+            with sqlite3.connect(self.cache_db) as conn:
+                row = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'coin_map_updated_at'"
+                ).fetchone()
+                if not row or int(row[0]) <= cutoff:
+                    return False
+                self._crypto_map = {
+                    sys.intern(sym): json.loads(ids)
+                    for sym, ids in conn.execute("SELECT symbol, ids FROM coin_map")
+                }
+                return bool(self._crypto_map)
+        except (sqlite3.Error, ValueError):
+            return False
+
+    def _save_map_to_disk(self):
+        """Persist the in-memory `_crypto_map` to the on-disk cache."""
+        if not self._crypto_map:
+            return
+        try:
+            with sqlite3.connect(self.cache_db) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS coin_map (symbol TEXT PRIMARY KEY, ids TEXT)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+                )
+                conn.execute("DELETE FROM coin_map")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO coin_map (symbol, ids) VALUES (?, ?)",
+                    [(s, json.dumps(ids)) for s, ids in self._crypto_map.items()],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('coin_map_updated_at', ?)",
+                    (str(int(time.time())),),
+                )
+        except sqlite3.Error as e:
+            logger.warning("Could not persist CoinGecko map cache: %s", e)
+
     def _load_map_sync(self):
         """Load the CoinGecko symbol->id map synchronously.
 
-        This method fetches the full coin list from the CoinGecko API and
-        populates the in-memory `_crypto_map` mapping uppercase symbol strings
-        to lists of CoinGecko ids. If the map is already loaded this is a
-        no-op.
+        This method first tries the on-disk cache and only falls back to
+        fetching the full coin list from the CoinGecko API, populating the
+        in-memory `_crypto_map` mapping uppercase symbol strings to lists of
+        CoinGecko ids. If the map is already loaded this is a no-op.
 
         Errors
         ------
@@ -38,13 +276,20 @@ class CoinGeckoClient:
         """
         if self._crypto_map:
             return
+        if time.monotonic() < self._fail_until:
+            return
+        if self._load_map_from_disk():
+            return
         try:
-            resp = requests.get(self.list_url, timeout=10)
-            data = resp.json()
-            self._crypto_map = defaultdict(list)
-            for coin in data:
-                self._crypto_map[coin["symbol"].upper()].append(coin["id"])
-        except Exception:
+            resp = self._session.get(self.list_url, timeout=10)
+            # orjson decodes the 10k+ row coin list several times faster than
+            # the stdlib decoder behind resp.json().
+            self._crypto_map = self._build_map(orjson.loads(resp.content))
+            self._filter_map_to_top_ids(self._fetch_top_ids_sync())
+            self._save_map_to_disk()
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self._fail_until = time.monotonic() + _FAIL_COOLDOWN_SECONDS
+            logger.warning("CoinGecko coin list fetch failed: %s", e)
             self._crypto_map = {}
 
     async def _load_map_async(self, session: aiohttp.ClientSession):
@@ -57,21 +302,83 @@ class CoinGeckoClient:
 
         Notes
         -----
-        This is the async counterpart to `_load_map_sync`. If the internal map
-        is already populated this method returns immediately. Exceptions are
-        caught and the map will be set to an empty dict on failure.
+        This is the async counterpart to `_load_map_sync` and shares the same
+        on-disk cache. If the internal map is already populated this method
+        returns immediately. Exceptions are caught and the map will be set to
+        an empty dict on failure.
         """
         if self._crypto_map:
             return
+        if time.monotonic() < self._fail_until:
+            return
+        if self._load_map_from_disk():
+            return
         try:
             async with session.get(self.list_url) as resp:
-                data = await resp.json()
-                self._crypto_map = defaultdict(list)
-                for coin in data:
-                    self._crypto_map[coin["symbol"].upper()].append(coin["id"])
-        except Exception:
+                self._crypto_map = self._build_map(orjson.loads(await resp.read()))
+            self._filter_map_to_top_ids(await self._fetch_top_ids_async(session))
+            self._save_map_to_disk()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError) as e:
+            self._fail_until = time.monotonic() + _FAIL_COOLDOWN_SECONDS
+            logger.warning("CoinGecko coin list fetch failed: %s", e)
             self._crypto_map = {}
 
+    def _get_cached_prices(self, ids: List[str]) -> Dict[str, float]:
+        """Return fresh cached market caps for the given CoinGecko ids.
+
+        Parameters
+        ----------
+        ids : list[str]
+            Candidate CoinGecko ids about to be priced.
+
+        Returns
+        -------
+        dict[str, float]
+            Mapping of id -> market cap for ids whose cached price is
+            younger than `price_minutes_to_expire`.
+        """
+        cutoff = int(time.time()) - self.price_minutes_to_expire * 60
+        try:
+            with sqlite3.connect(self.cache_db) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cg_prices "
+                    "(id TEXT PRIMARY KEY, market_cap REAL, updated_at INTEGER)"
+                )
+                rows = conn.execute(
+                    "SELECT id, market_cap FROM cg_prices WHERE updated_at > ? "
+                    "AND id IN (SELECT value FROM json_each(?))",
+                    (cutoff, json.dumps(ids)),
+                ).fetchall()
+                return dict(rows)
+        except sqlite3.Error:
+            return {}
+
+    def _save_cached_prices(self, prices: Dict[str, float]):
+        """Persist freshly fetched per-id market caps.
+
+        Parameters
+        ----------
+        prices : dict[str, float]
+            Mapping of CoinGecko id -> market cap to upsert into the
+            on-disk price cache.
+        """
+        if not prices:
+            return
+        now = int(time.time())
+        try:
+            with sqlite3.connect(self.cache_db) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cg_prices "
+                    "(id TEXT PRIMARY KEY, market_cap REAL, updated_at INTEGER)"
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cg_prices (id, market_cap, updated_at) "
+                    "VALUES (?, ?, ?)",
+                    [(cid, mcap, now) for cid, mcap in prices.items()],
+                )
+        except sqlite3.Error as e:
+            logger.warning("Could not persist CoinGecko price cache: %s", e)
+
     def _get_candidate_ids(
         self, symbols: List[str]
     ) -> tuple[List[str], Dict[str, str]]:
@@ -129,11 +436,22 @@ class CoinGeckoClient:
         if not ids:
             return results
 
+        # Serve recently priced ids from disk and only fetch the remainder.
+        cached = self._get_cached_prices(ids)
+        if cached:
+            self._process_response(
+                {cid: {"usd_market_cap": mcap} for cid, mcap in cached.items()},
+                id_map,
+                results,
+            )
+            ids = [cid for cid in ids if cid not in cached]
+
+        fetched = {}
         chunk_size = 200
         for i in range(0, len(ids), chunk_size):
             chunk = ids[i : i + chunk_size]
             try:
-                resp = requests.get(
+                resp = self._session.get(
                     self.price_url,
                     params={
                         "ids": ",".join(chunk),
@@ -142,10 +460,13 @@ class CoinGeckoClient:
                     },
                     timeout=10,
                 )
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 self._process_response(data, id_map, results)
-            except Exception:
-                pass
+                for cid, val in data.items():
+                    fetched[cid] = val.get("usd_market_cap", 0)
+            except (requests.RequestException, ValueError, KeyError) as e:
+                logger.warning("CoinGecko price chunk failed: %s", e)
+        self._save_cached_prices(fetched)
         return results
 
     async def get_prices_async(
@@ -176,22 +497,77 @@ class CoinGeckoClient:
         if not ids:
             return results
 
+        # Serve recently priced ids from disk and only fetch the remainder.
+        cached = self._get_cached_prices(ids)
+        if cached:
+            self._process_response(
+                {cid: {"usd_market_cap": mcap} for cid, mcap in cached.items()},
+                id_map,
+                results,
+            )
+            ids = [cid for cid in ids if cid not in cached]
+
+        # Chunks are independent requests; fire them concurrently (bounded by
+        # the semaphore) so wall time tracks the slowest chunk, not the sum.
+        fetched = {}
         chunk_size = 200
-        for i in range(0, len(ids), chunk_size):
-            chunk = ids[i : i + chunk_size]
-            try:
-                params = {
-                    "ids": ",".join(chunk),
-                    "vs_currencies": "usd",
-                    "include_market_cap": "true",
-                }
-                async with session.get(self.price_url, params=params) as resp:
-                    data = await resp.json()
-                    self._process_response(data, id_map, results)
-            except Exception:
-                pass
+        chunks = [ids[i : i + chunk_size] for i in range(0, len(ids), chunk_size)]
+        sem = asyncio.Semaphore(_MAX_CONCURRENT_CHUNKS)
+        await asyncio.gather(
+            *(
+                self._fetch_chunk_async(session, sem, chunk, id_map, results, fetched)
+                for chunk in chunks
+            )
+        )
+        self._save_cached_prices(fetched)
         return results
 
+    async def _fetch_chunk_async(
+        self,
+        session: aiohttp.ClientSession,
+        sem: asyncio.Semaphore,
+        chunk: List[str],
+        id_map: Dict[str, str],
+        results: Dict[str, Dict],
+        fetched: Dict[str, float],
+    ):
+        """Fetch and process one price chunk, updating shared mappings.
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            Active aiohttp session used to make the request.
+        sem : asyncio.Semaphore
+            Caps the number of chunks in flight at once.
+        chunk : list[str]
+            CoinGecko ids for this request (at most 200).
+        id_map : dict
+            Mapping of coin id -> parent symbol used to group results.
+        results : dict
+            Shared results mapping updated via `_process_response`.
+        fetched : dict
+            Shared id -> market cap mapping collected for the price cache.
+        """
+        params = {
+            "ids": ",".join(chunk),
+            "vs_currencies": "usd",
+            "include_market_cap": "true",
+        }
+        try:
+            async with sem:
+                async with session.get(self.price_url, params=params) as resp:
+                    data = orjson.loads(await resp.read())
+            self._process_response(data, id_map, results)
+            for cid, val in data.items():
+                fetched[cid] = val.get("usd_market_cap", 0)
+        except (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            ValueError,
+            KeyError,
+        ) as e:
+            logger.warning("CoinGecko price chunk failed: %s", e)
+
     def _process_response(self, data, id_map, results):
         """Process a CoinGecko price response and update results.
 
@@ -205,13 +581,26 @@ class CoinGeckoClient:
             Mutable mapping that will be updated in-place with the best
             candidate per parent symbol (highest market cap wins).
         """
+        # Track the winner per parent as a plain (mcap, cid) tuple and only
+        # materialize result dicts once at the end; the old loop allocated a
+        # throwaway empty dict and did two lookups per coin, which adds up
+        # when batches approach 10k coins.
+        best = {}
+        parent_of = id_map.get
+        best_get = best.get
         for cid, val in data.items():
-            parent = id_map.get(cid)
-            if parent:
-                mcap = val.get("usd_market_cap", 0)
-                if mcap > results.get(parent, {}).get("market_cap", 0):
-                    results[parent] = {
-                        "market_cap": mcap,
-                        "name": cid.title(),
-                        "id": cid,
-                    }
+            parent = parent_of(cid)
+            if parent is None:
+                continue
+            mcap = val.get("usd_market_cap") or 0
+            cur = best_get(parent)
+            if cur is None or mcap > cur[0]:
+                best[parent] = (mcap, cid)
+        for parent, (mcap, cid) in best.items():
+            existing = results.get(parent)
+            if existing is None or mcap > existing["market_cap"]:
+                results[parent] = {
+                    "market_cap": mcap,
+                    "name": cid.title(),
+                    "id": cid,
+                }
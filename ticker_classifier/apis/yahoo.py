@@ -10,10 +10,38 @@ Notes
 Docstrings follow the NumPy documentation style.
 """
 
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# After an auth or quote failure, skip Yahoo for this long instead of
+# re-attempting (and re-failing) on every classify call.
+_FAIL_COOLDOWN_SECONDS = 30.0
+
+# Reuse a cookie/crumb pair for this long before refreshing proactively;
+# a 401 still invalidates it immediately.
+_CREDS_TTL_SECONDS = 30 * 60.0
+
+# On-disk credential lifetime; Yahoo crumbs typically stay valid for at
+# least a day, so 12 hours is conservative.
+_CREDS_DISK_TTL_SECONDS = 12 * 3600
+_CREDS_META_KEY = "yahoo_creds"
+
+# Yahoo's quote endpoint caps symbols per request (~200-250); larger lists
+# are sharded into chunks this size and fetched concurrently, with the
+# in-flight count bounded to stay clear of 429s.
+_QUOTE_CHUNK_SIZE = 200
+_MAX_CONCURRENT_CHUNKS = 8
 
 API_BASE = "https://query2.finance.yahoo.com"
 COOKIE_URL = "https://fc.yahoo.com"
@@ -26,19 +54,97 @@ HEADERS = {
 
 
 class YahooClient:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, cache=None):
         """Initialize a new :class:`YahooClient`.
 
         The client maintains an in-memory cache of authentication
         credentials (cookie + crumb) so repeated requests do not need to
         re-authenticate on every call.
 
+        Parameters
+        ----------
+        session : requests.Session, optional
+            Shared session for synchronous requests. Reusing one session
+            keeps TCP/TLS connections alive between calls; when omitted a
+            private session is created.
+        cache : TickerCache, optional
+            Cache whose meta table is used to persist credentials across
+            processes, so short-lived invocations skip the two-RTT
+            cookie/crumb handshake. Credentials stay purely in memory when
+            omitted.
+
         Returns
         -------
         None
         """
 
         self.credentials: Optional[Dict[str, Any]] = None
+        self._session = session or requests.Session()
+        self._cache = cache
+        self._fail_until = 0.0
+        self._creds_expire = 0.0
+        # Yahoo intermittently answers 429/5xx; a small bounded retry with
+        # backoff smooths that over. Mounted on the Yahoo hosts only, so a
+        # session shared with other clients keeps its own adapter elsewhere.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self._session.mount(API_BASE, adapter)
+        self._session.mount(COOKIE_URL, adapter)
+
+    def _set_credentials(self, cookie: Dict[str, str], crumb: str):
+        """Store fresh credentials in memory and, when possible, on disk."""
+        self.credentials = {"cookie": cookie, "crumb": crumb}
+        self._creds_expire = time.monotonic() + _CREDS_TTL_SECONDS
+        if self._cache is not None:
+            payload = {
+                "cookie": cookie,
+                "crumb": crumb,
+                "expires_at": int(time.time()) + _CREDS_DISK_TTL_SECONDS,
+            }
+            self._cache.set_meta(_CREDS_META_KEY, orjson.dumps(payload).decode())
+
+    def _load_credentials_from_disk(self) -> Optional[Dict[str, Any]]:
+        """Restore persisted credentials, skipping the auth round trips.
+
+        Returns
+        -------
+        dict or None
+            The restored credentials dict, or None when no cache is wired,
+            the stored entry is missing/expired, or it cannot be decoded.
+        """
+        if self._cache is None:
+            return None
+        raw = self._cache.get_meta(_CREDS_META_KEY)
+        if raw is None:
+            return None
+        try:
+            payload = orjson.loads(raw)
+            expires_at = payload["expires_at"]
+            cookie, crumb = payload["cookie"], payload["crumb"]
+        except (ValueError, KeyError, TypeError):
+            return None
+        remaining = expires_at - time.time()
+        if remaining <= 0 or not crumb:
+            return None
+        self.credentials = {"cookie": cookie, "crumb": crumb}
+        self._creds_expire = time.monotonic() + min(remaining, _CREDS_TTL_SECONDS)
+        # The sync quote path relies on the session cookie jar.
+        self._session.cookies.update(cookie)
+        return self.credentials
+
+    def _clear_credentials(self):
+        """Drop credentials from memory and the on-disk meta entry."""
+        self.credentials = None
+        self._creds_expire = 0.0
+        if self._cache is not None:
+            self._cache.delete_meta(_CREDS_META_KEY)
 
     def _get_credentials_sync(self):
         """Fetch cookie and crumb synchronously.
@@ -54,25 +160,30 @@ class YahooClient:
             Dictionary with keys ``'cookie'`` and ``'crumb'`` when
             successful, otherwise ``None``.
         """
-        if self.credentials:
+        if self.credentials and time.monotonic() < self._creds_expire:
+            return self.credentials
+        if self._load_credentials_from_disk():
             return self.credentials
+        if time.monotonic() < self._fail_until:
+            return None
 
         try:
             # 1. Get Cookies (allow redirects)
             # fc.yahoo.com redirects to a consent page or main page, setting cookies along the way
-            response_cookie = requests.get(COOKIE_URL, headers=HEADERS, timeout=5)
+            response_cookie = self._session.get(COOKIE_URL, headers=HEADERS, timeout=5)
             cookies = response_cookie.cookies
 
-            # 2. Get Crumb (using the cookies)
-            response_crumb = requests.get(
-                CRUMB_URL, headers=HEADERS, cookies=cookies, timeout=5
-            )
+            # 2. Get Crumb (the session cookie jar carries the cookies)
+            response_crumb = self._session.get(CRUMB_URL, headers=HEADERS, timeout=5)
             crumb = response_crumb.text
 
             if crumb:
-                self.credentials = {"cookie": cookies, "crumb": crumb}
-        except Exception as e:
-            print(f"Yahoo Auth Error (Sync): {e}")
+                self._set_credentials(
+                    requests.utils.dict_from_cookiejar(cookies), crumb
+                )
+        except (requests.RequestException, ValueError) as e:
+            self._fail_until = time.monotonic() + _FAIL_COOLDOWN_SECONDS
+            logger.warning("Yahoo auth failed (sync): %s", e)
 
         return self.credentials
 
@@ -98,35 +209,88 @@ class YahooClient:
 
         creds = self._get_credentials_sync()
         if not creds:
-            print("Skipping Yahoo Sync: No credentials.")
+            logger.warning("Skipping Yahoo quote fetch (sync): no credentials")
             return results
 
+        chunks = [
+            symbols[i : i + _QUOTE_CHUNK_SIZE]
+            for i in range(0, len(symbols), _QUOTE_CHUNK_SIZE)
+        ]
+        if len(chunks) == 1:
+            return self._fetch_chunk_sync(chunks[0], creds["crumb"])
+
+        workers = min(_MAX_CONCURRENT_CHUNKS, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._fetch_chunk_sync, chunk, creds["crumb"])
+                for chunk in chunks
+            ]
+            for fut in futures:
+                results.update(fut.result())
+        return results
+
+    def _fetch_chunk_sync(self, chunk: List[str], crumb: str) -> Dict[str, Dict]:
+        """Fetch one quote chunk synchronously.
+
+        Parameters
+        ----------
+        chunk : list of str
+            Symbols for this request (at most ``_QUOTE_CHUNK_SIZE``).
+        crumb : str
+            Crumb token from the current credentials.
+
+        Returns
+        -------
+        dict
+            Mapping of upper-case symbol to quote data for this chunk;
+            empty on failure.
+        """
+        results = {}
         try:
-            params = {"symbols": ",".join(symbols), "crumb": creds["crumb"]}
+            params = {"symbols": ",".join(chunk), "crumb": crumb}
 
-            resp = requests.get(
+            # The session cookie jar still holds the auth cookies from
+            # _get_credentials_sync; no need to pass them per request.
+            resp = self._session.get(
                 QUOTE_URL,
                 params=params,
-                cookies=creds["cookie"],
                 headers=HEADERS,
                 timeout=5,
             )
 
             if resp.status_code == 200:
-                data = resp.json()
-                if "quoteResponse" in data and "result" in data["quoteResponse"]:
-                    for item in data["quoteResponse"]["result"]:
-                        results[item["symbol"].upper()] = item
+                # orjson decodes the multi-KB quote payload well faster than
+                # the stdlib parser behind resp.json().
+                data = orjson.loads(resp.content)
+                self._collect_quotes(data, results)
             elif resp.status_code == 401:
                 # Credentials expired? Clear them for next time.
-                self.credentials = None
-                print("Yahoo 401 Unauthorized (Sync). Credentials cleared.")
+                self._clear_credentials()
+                logger.warning("Yahoo 401 Unauthorized (sync); credentials cleared")
 
-        except Exception as e:
-            print(f"Yahoo Sync Request Error: {e}")
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self._fail_until = time.monotonic() + _FAIL_COOLDOWN_SECONDS
+            logger.warning("Yahoo quote request failed (sync): %s", e)
 
         return results
 
+    @staticmethod
+    def _collect_quotes(data: Dict, results: Dict[str, Dict]):
+        """Copy quote items from a decoded payload into ``results``.
+
+        Yahoo returns ~60 fields per quote and the classifier reads four of
+        them, so only those are kept; the rest of each quote dict becomes
+        garbage as soon as the payload is dropped.
+        """
+        if "quoteResponse" in data and "result" in data["quoteResponse"]:
+            for item in data["quoteResponse"]["result"]:
+                results[item["symbol"].upper()] = {
+                    "quoteType": item.get("quoteType", "UNKNOWN"),
+                    "marketCap": item.get("marketCap", 0),
+                    "shortName": item.get("shortName"),
+                    "longName": item.get("longName"),
+                }
+
     async def _get_credentials_async(self, session: aiohttp.ClientSession):
         """Fetch cookie and crumb asynchronously.
 
@@ -143,16 +307,19 @@ class YahooClient:
             Dictionary with keys ``'cookie'`` and ``'crumb'`` when
             successful, otherwise ``None``.
         """
-        if self.credentials:
+        if self.credentials and time.monotonic() < self._creds_expire:
             return self.credentials
+        if self._load_credentials_from_disk():
+            return self.credentials
+        if time.monotonic() < self._fail_until:
+            return None
 
         try:
             # 1. Get Cookies
-            # aiohttp session handles cookies automatically in its cookie_jar if we share the session.
-            # However, to be safe and explicit (since we pass cookies manually later), we extract them.
-            async with session.get(COOKIE_URL, headers=HEADERS) as resp:
-                await resp.read()  # Read body to ensure cookies are processed
-                # Access cookies from the response history or the session cookie jar
+            # aiohttp stores cookies in the session jar when the response
+            # headers are parsed, so the (tens-of-KB) consent-page body does
+            # not need to be downloaded; releasing the response is enough.
+            async with session.get(COOKIE_URL, headers=HEADERS):
                 pass
 
             # 2. Get Crumb
@@ -167,10 +334,11 @@ class YahooClient:
                         k: v.value
                         for k, v in session.cookie_jar.filter_cookies(CRUMB_URL).items()
                     }
-                    self.credentials = {"cookie": cookies, "crumb": crumb}
+                    self._set_credentials(cookies, crumb)
 
-        except Exception as e:
-            print(f"Yahoo Auth Error (Async): {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self._fail_until = time.monotonic() + _FAIL_COOLDOWN_SECONDS
+            logger.warning("Yahoo auth failed (async): %s", e)
 
         return self.credentials
 
@@ -200,26 +368,66 @@ class YahooClient:
 
         creds = await self._get_credentials_async(session)
         if not creds:
-            print("Skipping Yahoo Async: No credentials.")
+            logger.warning("Skipping Yahoo quote fetch (async): no credentials")
             return results
 
+        chunks = [
+            symbols[i : i + _QUOTE_CHUNK_SIZE]
+            for i in range(0, len(symbols), _QUOTE_CHUNK_SIZE)
+        ]
+        sem = asyncio.Semaphore(_MAX_CONCURRENT_CHUNKS)
+        chunk_results = await asyncio.gather(
+            *(self._fetch_chunk_async(session, sem, chunk, creds) for chunk in chunks)
+        )
+        for chunk_result in chunk_results:
+            results.update(chunk_result)
+        return results
+
+    async def _fetch_chunk_async(
+        self,
+        session: aiohttp.ClientSession,
+        sem: asyncio.Semaphore,
+        chunk: List[str],
+        creds: Dict[str, Any],
+    ) -> Dict[str, Dict]:
+        """Fetch one quote chunk asynchronously.
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            Active aiohttp session used for the request.
+        sem : asyncio.Semaphore
+            Caps the number of chunks in flight at once.
+        chunk : list of str
+            Symbols for this request (at most ``_QUOTE_CHUNK_SIZE``).
+        creds : dict
+            Credentials with ``'cookie'`` and ``'crumb'`` keys.
+
+        Returns
+        -------
+        dict
+            Mapping of upper-case symbol to quote data for this chunk;
+            empty on failure.
+        """
+        results = {}
         try:
-            params = {"symbols": ",".join(symbols), "crumb": creds["crumb"]}
+            params = {"symbols": ",".join(chunk), "crumb": creds["crumb"]}
 
             # aiohttp allows passing cookies as a dict
-            async with session.get(
-                QUOTE_URL, params=params, cookies=creds["cookie"], headers=HEADERS
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if "quoteResponse" in data and "result" in data["quoteResponse"]:
-                        for item in data["quoteResponse"]["result"]:
-                            results[item["symbol"].upper()] = item
-                elif resp.status == 401:
-                    self.credentials = None
-                    print("Yahoo 401 Unauthorized (Async). Credentials cleared.")
-
-        except Exception as e:
-            print(f"Yahoo Async Request Error: {e}")
+            async with sem:
+                async with session.get(
+                    QUOTE_URL, params=params, cookies=creds["cookie"], headers=HEADERS
+                ) as resp:
+                    if resp.status == 200:
+                        self._collect_quotes(orjson.loads(await resp.read()), results)
+                    elif resp.status == 401:
+                        self._clear_credentials()
+                        logger.warning(
+                            "Yahoo 401 Unauthorized (async); credentials cleared"
+                        )
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError) as e:
+            self._fail_until = time.monotonic() + _FAIL_COOLDOWN_SECONDS
+            logger.warning("Yahoo quote request failed (async): %s", e)
 
         return results
@@ -1,13 +1,59 @@
 import asyncio
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List
 
 import aiohttp
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
 from .apis.coingecko import CoinGeckoClient
 from .apis.yahoo import YahooClient
 from .constants import MAJOR_FOREX, MINOR_FOREX, SHORTCUTS
 from .db.cache import TickerCache
 
+logger = logging.getLogger(__name__)
+
+# API batches slower than this get a warning so degraded upstreams are visible.
+_SLOW_FETCH_SECONDS = 5.0
+
+# Hard deadline for async HTTP, mirroring the timeout= on every sync request;
+# without it one hung upstream response stalls a whole classify_async call.
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3)
+
+# Hot-path containers hoisted to module scope: a tuple for iteration order and
+# a frozenset for O(1) membership, instead of rebuilding literal lists per call.
+_DUEL_KEYS = ("stock", "crypto", "forex")
+_BASE_SCORE_QTYPES = frozenset({"EQUITY", "ETF"})
+
+# Duel score constants, hoisted so _process_duel does not rebind them per call.
+# Major forex always outranks any market cap; minor forex sits below large
+# caps; index/future quotes get fixed boosts since Yahoo reports no mcap.
+_SCORE_FOREX_MAJOR = 100_000_000_000_000
+_SCORE_FOREX_MINOR = 50_000_000
+_SCORE_INDEX = 50_000_000_000
+_SCORE_FUTURE = 10_000_000_000
+_SCORE_MICRO_CAP = 250_000
+# 1 MILLION USD THRESHOLD
+# If a crypto is smaller than this, we treat it as "Noise" if it clashes with
+# a stock ticker.
+_MIN_CRYPTO_MCAP = 1_000_000
+
+
+@lru_cache(maxsize=512)
+def _forex_detail(sym: str) -> Dict:
+    """Return the (shared, read-only) forex detail dict for a symbol.
+
+    The duel loop only ever reads these, so caching them avoids
+    re-allocating the same three-key dict and formatted name for every
+    recurring forex code.
+    """
+    return {"type": "Forex", "name": f"{sym} Currency", "market_cap": None}
+
 
 class TickerClassifier:
     def __init__(self, db_name: str = "ticker_cache.db", hours_to_expire: int = 24):
@@ -21,8 +67,138 @@ class TickerClassifier:
             Hours after which cached entries expire, by default 24.
         """
         self.cache = TickerCache(db_name, hours_to_expire)
-        self.yahoo = YahooClient()
-        self.cg = CoinGeckoClient()
+        # One pooled session shared by both sync clients: after the first
+        # request per host the TCP/TLS handshake is amortized away instead
+        # of being paid again on every lookup.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self._session.mount("https://", adapter)
+        self.yahoo = YahooClient(session=self._session, cache=self.cache)
+        self.cg = CoinGeckoClient(session=self._session)
+        # Persistent two-worker pool for overlapping the sync Yahoo and
+        # CoinGecko fetches; spinning threads up per classify call wastes
+        # a few hundred microseconds each time.
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        # The aiohttp counterpart is created lazily on the first async call
+        # (a session must be built on a running loop) and reused afterwards,
+        # so keep-alive connections to both upstream hosts survive between
+        # classify_async batches.
+        self._async_session = None
+        # Unified static-answer table: shortcuts plus major forex, whose duel
+        # outcome is fixed (their heuristic score beats any market cap), so
+        # both resolve with a single dict probe and no API work. Minor forex
+        # stays out — a large-cap crypto can still outrank its score. Keys are
+        # interned so probes against normalized symbols compare by pointer.
+        self._static = {
+            sys.intern(k): {**v, "source": "shortcut"} for k, v in SHORTCUTS.items()
+        }
+        for s in MAJOR_FOREX:
+            self._static[sys.intern(s)] = {
+                "category": "forex",
+                "ticker": s,
+                "name": f"{s} Currency",
+                "market_cap": None,
+                "yahoo_lookup": f"{s}USD=X",
+                "alternatives": [],
+                "source": "static",
+            }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            Open session reused across `classify_async` calls, so TCP/TLS
+            handshakes and DNS lookups are paid once per host instead of
+            once per batch.
+        """
+        if self._async_session is None or self._async_session.closed:
+            # Explicit connector tuning: per-host pools keep the Yahoo and
+            # CoinGecko fetches (and CoinGecko's concurrent price chunks)
+            # from serializing on one socket, and the DNS cache drops the
+            # per-request resolver round trip.
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=8,
+                ttl_dns_cache=600,
+                use_dns_cache=True,
+                enable_cleanup_closed=True,
+            )
+            self._async_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=_HTTP_TIMEOUT,
+                # Any outgoing json= payload is encoded by orjson; responses
+                # are already decoded with orjson.loads at the call sites.
+                json_serialize=lambda obj: orjson.dumps(obj).decode(),
+            )
+        return self._async_session
+
+    def close(self):
+        """Shut down the persistent thread pool used by the sync path."""
+        self._executor.shutdown(wait=False)
+
+    async def aclose(self):
+        """Close the shared aiohttp session, if one was created."""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    @staticmethod
+    def _static_result(entry: Dict) -> Dict:
+        """Copy a static-table entry for handing to the caller.
+
+        The alternatives list (present on the forex entries) is copied as
+        well; a plain dict() copy would share it with the table, so a caller
+        mutating a returned result would poison every later lookup.
+        """
+        result = dict(entry)
+        if "alternatives" in result:
+            result["alternatives"] = list(result["alternatives"])
+        return result
+
+    @staticmethod
+    def _log_fetch_time(started: float, n_symbols: int):
+        """Log how long an API batch took; warn when it exceeds the threshold.
+
+        Parameters
+        ----------
+        started : float
+            `time.perf_counter()` value captured before dispatching the batch.
+        n_symbols : int
+            Number of symbols in the batch, for log context.
+        """
+        elapsed = time.perf_counter() - started
+        if elapsed > _SLOW_FETCH_SECONDS:
+            logger.warning("Slow API fetch: %.2fs for %d symbols", elapsed, n_symbols)
+        else:
+            logger.debug("API fetch took %.3fs for %d symbols", elapsed, n_symbols)
+
+    @staticmethod
+    def _crypto_candidates(to_process: List[str]) -> List[str]:
+        """Filter out symbols that never need a CoinGecko lookup.
+
+        Major forex codes always win the duel (their heuristic score exceeds
+        any crypto market cap), so sending them to CoinGecko only inflates
+        the candidate-id list and the payload to parse.
+
+        Parameters
+        ----------
+        to_process : list[str]
+            Uppercase symbols queued for API lookups.
+
+        Returns
+        -------
+        list[str]
+            Symbols worth querying on CoinGecko.
+        """
+        return [s for s in to_process if s not in MAJOR_FOREX]
 
     def _process_duel(
         self, to_process: List[str], yahoo_data: Dict, crypto_data: Dict
@@ -52,91 +228,82 @@ class TickerClassifier:
             `yahoo_lookup`.
         """
         processed = {}
-        # Init structure
-        duel = {
-            s: {"stock": 0, "crypto": 0, "forex": 0, "details": {}} for s in to_process
-        }
-
-        # 1 MILLION USD THRESHOLD
-        # If a crypto is smaller than this, we treat it as "Noise" if it clashes with a stock ticker.
-        MIN_CRYPTO_MCAP = 1_000_000
 
+        # Scores and details live in plain locals per symbol instead of a
+        # per-symbol dict-of-dicts shell; this drops two nested dict
+        # allocations plus the repeated key hashing for every symbol.
         for sym in to_process:
+            s_stock = s_crypto = s_forex = 0
+            det_stock = det_crypto = det_forex = None
+
             # 1. Forex Heuristics
             if sym in MAJOR_FOREX:
-                duel[sym]["forex"] = 100_000_000_000_000
-                duel[sym]["details"]["forex"] = {
-                    "type": "Forex",
-                    "name": f"{sym} Currency",
-                    "market_cap": None,
-                }
+                s_forex = _SCORE_FOREX_MAJOR
+                det_forex = _forex_detail(sym)
             elif sym in MINOR_FOREX:
-                duel[sym]["forex"] = 50_000_000
-                duel[sym]["details"]["forex"] = {
-                    "type": "Forex",
-                    "name": f"{sym} Currency",
-                    "market_cap": None,
-                }
+                s_forex = _SCORE_FOREX_MINOR
+                det_forex = _forex_detail(sym)
 
             # 2. Stock Data
-            if sym in yahoo_data:
-                info = yahoo_data[sym]
+            info = yahoo_data.get(sym)
+            if info is not None:
                 qtype = info.get("quoteType", "UNKNOWN")
                 raw_mcap = info.get("marketCap", 0)
-                score = raw_mcap
+                s_stock = raw_mcap
 
                 # Boost logic
                 if qtype == "INDEX":
-                    score = 50_000_000_000
+                    s_stock = _SCORE_INDEX
                 if qtype == "FUTURE":
-                    score = 10_000_000_000
+                    s_stock = _SCORE_FUTURE
 
                 # If we found a valid stock object but mcap is missing/0,
                 # give it a base score so it beats tiny cryptos.
-                if score == 0 and qtype in ["EQUITY", "ETF"]:
-                    score = 250_000  # Assume at least micro-cap stock
+                if s_stock == 0 and qtype in _BASE_SCORE_QTYPES:
+                    s_stock = _SCORE_MICRO_CAP  # Assume at least micro-cap stock
 
-                duel[sym]["stock"] = score
-                duel[sym]["details"]["stock"] = {
+                det_stock = {
                     "type": qtype,
                     "name": info.get("shortName") or info.get("longName"),
                     "market_cap": raw_mcap,
                 }
 
             # 3. Crypto Data
-            if sym in crypto_data:
-                info = crypto_data[sym]
-                mcap = info.get("market_cap", 0)
-                duel[sym]["crypto"] = mcap
-                duel[sym]["details"]["crypto"] = {
+            info = crypto_data.get(sym)
+            if info is not None:
+                s_crypto = info.get("market_cap", 0)
+                det_crypto = {
                     "type": "Crypto",
                     "name": info.get("name"),
-                    "market_cap": mcap,
+                    "market_cap": s_crypto,
                 }
 
-            # 4. Resolve
-            scores = duel[sym]
-            winner = max(["stock", "crypto", "forex"], key=lambda k: scores[k])
+            # 4. Resolve. Inline comparisons, ties resolved in
+            # stock/crypto/forex order.
+            if s_stock >= s_crypto and s_stock >= s_forex:
+                winner, score, details = "stock", s_stock, det_stock
+            elif s_crypto >= s_forex:
+                winner, score, details = "crypto", s_crypto, det_crypto
+            else:
+                winner, score, details = "forex", s_forex, det_forex
 
             # If Crypto won, but it's tiny (< $1M), and we tried to look up a Stock...
             # It's highly likely this is a "Fake" token or the Yahoo lookup failed.
-            if winner == "crypto":
-                mcap = scores["crypto"]
-                if mcap < MIN_CRYPTO_MCAP:
-                    # If the stock score was 0 (Yahoo failed), we'd rather return "Unknown"
-                    # than return a $1,000 junk token for "NVDA".
-                    winner = "unknown"
+            if winner == "crypto" and s_crypto < _MIN_CRYPTO_MCAP:
+                # If the stock score was 0 (Yahoo failed), we'd rather return "Unknown"
+                # than return a $1,000 junk token for "NVDA".
+                winner = "unknown"
 
             # Construct Result
-            if winner == "unknown" or scores[winner] == 0:
+            if winner == "unknown" or score == 0:
                 final = {"category": "Unknown", "ticker": sym}
             else:
-                details = scores["details"].get(winner, {})
-                alternatives = [
-                    k
-                    for k in ["stock", "crypto", "forex"]
-                    if scores[k] > 0 and k != winner
-                ]
+                if details is None:
+                    details = {}
+                alternatives = []
+                for key, s in zip(_DUEL_KEYS, (s_stock, s_crypto, s_forex)):
+                    if s > 0 and key != winner:
+                        alternatives.append(key)
 
                 y_look = sym
                 if winner == "crypto":
@@ -171,28 +338,55 @@ class TickerClassifier:
         list[dict]
             List of classification dictionaries aligned with the input order.
         """
-        unique = list({s.upper().strip() for s in symbols if s.strip()})
+        # Fast path: a single warm symbol should not pay the bulk machinery
+        # (dedupe set, results map, batch cache query).
+        if len(symbols) == 1:
+            sym = sys.intern(symbols[0].upper().strip())
+            if not sym:
+                return [None]
+            static = self._static.get(sym)
+            if static is not None:
+                return [self._static_result(static)]
+            hit = self.cache.get_one(sym)
+            if hit is not None:
+                return [hit]
+
+        # Normalize once; the same forms are reused when aligning the output,
+        # avoiding a second round of string allocations per symbol. Interning
+        # makes the static-table and results-map probes pointer-equality fast
+        # paths, since those dicts already hold interned keys.
+        normalized = [sys.intern(s.upper().strip()) for s in symbols]
+        # dict.fromkeys dedupes in C while keeping first-seen order.
+        unique = list(dict.fromkeys(s for s in normalized if s))
         results_map = {}
         to_process = []
 
         # Cache check
         cached = self.cache.get_many(unique)
         for sym in unique:
-            if sym in SHORTCUTS:
-                results_map[sym] = {**SHORTCUTS[sym], "source": "shortcut"}
+            static = self._static.get(sym)
+            if static is not None:
+                results_map[sym] = self._static_result(static)
             elif sym in cached:
                 results_map[sym] = cached[sym]
             else:
                 to_process.append(sym)
 
         if to_process:
-            y_res = self.yahoo.get_quotes_sync(to_process)
-            c_res = self.cg.get_prices_sync(to_process)
+            # Yahoo and CoinGecko are independent hosts; overlap the two
+            # network waits instead of paying them back-to-back.
+            cg_symbols = self._crypto_candidates(to_process)
+            started = time.perf_counter()
+            fut_y = self._executor.submit(self.yahoo.get_quotes_sync, to_process)
+            fut_c = self._executor.submit(self.cg.get_prices_sync, cg_symbols)
+            y_res = fut_y.result()
+            c_res = fut_c.result()
+            self._log_fetch_time(started, len(to_process))
             processed = self._process_duel(to_process, y_res, c_res)
             self.cache.save_many(processed)
             results_map.update(processed)
 
-        return [results_map.get(s.upper().strip()) for s in symbols]
+        return [results_map.get(s) for s in normalized]
 
     async def classify_async(self, symbols: List[str]) -> List[Dict]:
         """Asynchronously classify a list of ticker-like symbols.
@@ -209,27 +403,52 @@ class TickerClassifier:
             Classification results aligned with the input list; entries may
             be `None` for unknown symbols.
         """
-        unique = list({s.upper().strip() for s in symbols if s.strip()})
+        # Normalize once; the same forms are reused when aligning the output,
+        # avoiding a second round of string allocations per symbol. Interning
+        # makes the static-table and results-map probes pointer-equality fast
+        # paths, since those dicts already hold interned keys.
+        normalized = [sys.intern(s.upper().strip()) for s in symbols]
+        # dict.fromkeys dedupes in C while keeping first-seen order.
+        unique = list(dict.fromkeys(s for s in normalized if s))
         results_map = {}
         to_process = []
 
-        # Cache Read (Run in thread to avoid blocking loop)
+        # Cache Read (Run in thread to avoid blocking loop). While SQLite
+        # works, warm up Yahoo's cookie/crumb in parallel — a no-op when the
+        # credentials are still fresh, and otherwise its two auth round
+        # trips overlap the cache read instead of delaying the quote fetch.
         loop = asyncio.get_running_loop()
-        cached = await loop.run_in_executor(None, self.cache.get_many, unique)
+        cache_fut = loop.run_in_executor(None, self.cache.get_many, unique)
+        session = await self._get_session()
+        warm_task = asyncio.create_task(self.yahoo._get_credentials_async(session))
+        cached = await cache_fut
 
         for sym in unique:
-            if sym in SHORTCUTS:
-                results_map[sym] = {**SHORTCUTS[sym], "source": "shortcut"}
+            static = self._static.get(sym)
+            if static is not None:
+                results_map[sym] = self._static_result(static)
             elif sym in cached:
                 results_map[sym] = cached[sym]
             else:
                 to_process.append(sym)
 
-        if to_process:
-            async with aiohttp.ClientSession() as session:
-                task_y = self.yahoo.get_quotes_async(session, to_process)
-                task_c = self.cg.get_prices_async(session, to_process)
-                y_res, c_res = await asyncio.gather(task_y, task_c)
+        if not to_process:
+            warm_task.cancel()
+        else:
+            started = time.perf_counter()
+            # Schedule CoinGecko first so its I/O proceeds while any
+            # remainder of the Yahoo auth warm-up finishes; the quote fetch
+            # is only created afterwards so it reuses the warmed credentials
+            # instead of racing a second auth.
+            task_c = asyncio.create_task(
+                self.cg.get_prices_async(session, self._crypto_candidates(to_process))
+            )
+            await warm_task
+            task_y = asyncio.create_task(
+                self.yahoo.get_quotes_async(session, to_process)
+            )
+            y_res, c_res = await asyncio.gather(task_y, task_c)
+            self._log_fetch_time(started, len(to_process))
 
             processed = self._process_duel(to_process, y_res, c_res)
 
@@ -237,4 +456,4 @@ class TickerClassifier:
             await loop.run_in_executor(None, self.cache.save_many, processed)
             results_map.update(processed)
 
-        return [results_map.get(s.upper().strip()) for s in symbols]
+        return [results_map.get(s) for s in normalized]
@@ -1,40 +1,237 @@
 import json
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List
 
+# Upper bound on the in-process LRU in front of SQLite; hot polling workloads
+# touch far fewer distinct symbols than this.
+_MEM_MAX = 4096
+
 
 class TickerCache:
-    def __init__(self, db_name: str, hours_to_expire: int):
+    # Constant statement text (symbols bound as one JSON array) so SQLite can
+    # reuse the prepared plan instead of re-parsing a fresh IN (?,?,...) list
+    # of varying arity on every call.
+    _SELECT_MANY_SQL = (
+        "SELECT symbol, category, name, market_cap, yahoo_lookup, alternatives, "
+        "expires_at FROM tickers "
+        "WHERE symbol IN (SELECT value FROM json_each(?)) AND expires_at > ?"
+    )
+    _SELECT_ONE_SQL = (
+        "SELECT symbol, category, name, market_cap, yahoo_lookup, alternatives, "
+        "expires_at FROM tickers WHERE symbol = ? AND expires_at > ?"
+    )
+    _UPSERT_SQL = (
+        "INSERT OR REPLACE INTO tickers "
+        "(symbol, category, name, market_cap, yahoo_lookup, alternatives, "
+        "updated_at, expires_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    # WITHOUT ROWID clusters rows in the symbol primary-key B-tree itself,
+    # so a point lookup is one tree descent instead of index-then-rowid.
+    _CREATE_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS tickers (
+            symbol TEXT PRIMARY KEY,
+            category TEXT,
+            name TEXT,
+            market_cap REAL,
+            yahoo_lookup TEXT,
+            alternatives TEXT,
+            updated_at INTEGER,
+            expires_at INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """
+
+    def __init__(
+        self, db_name: str, hours_to_expire: int, unknown_hours_to_expire: int = 1
+    ):
         """Initialize the ticker cache.
 
+        A single SQLite connection is opened here and reused for the lifetime
+        of the cache, keeping SQLite's page cache and prepared-statement
+        cache warm across calls. A small in-process LRU sits in front of
+        SQLite so hot symbols skip the B-tree and row decoding entirely.
+
         Parameters
         ----------
         db_name : str
             Path or name of the SQLite database file used for caching.
         hours_to_expire : int
             Number of hours after which cached entries are considered expired.
+        unknown_hours_to_expire : int, optional
+            Shorter expiry applied to `'Unknown'` results, by default 1.
+            Negative-caching them stops repeated lookups of garbage symbols
+            from re-hitting both APIs on every call, while still retrying
+            soon in case the earlier miss was a transient upstream failure.
         """
         self.db_name = db_name
         self.hours_to_expire = hours_to_expire
+        self._expire_seconds = hours_to_expire * 3600
+        self._unknown_expire_seconds = unknown_hours_to_expire * 3600
+        self._conn = sqlite3.connect(
+            db_name, check_same_thread=False, cached_statements=256
+        )
+        # classify_async runs cache calls on executor threads; one lock
+        # serializes connection and LRU access across them.
+        self._lock = threading.Lock()
+        self._mem = OrderedDict()  # symbol -> (expires_at, clean item dict)
+        self._tune_db()
         self._init_db()
 
+    def _tune_db(self):
+        """Apply one-time PRAGMA tuning to the connection.
+
+        WAL journaling with `synchronous=NORMAL` avoids a full fsync per
+        write transaction, and the memory/mmap settings keep hot pages out
+        of the syscall path.
+        """
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-64000")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+
     def _init_db(self):
         """Create the `tickers` table if it does not already exist.
 
-        The table stores `symbol` as the primary key, the JSON-serialized
-        `data` blob and an ISO-formatted `updated_at` timestamp.
+        Classification results always carry the same fields, so they are
+        stored as real columns instead of a JSON blob — reads unpack a row
+        tuple straight into a dict with no parse step. `updated_at` and
+        `expires_at` are unix epochs; an index on `expires_at` turns the
+        freshness filter into a B-tree seek.
         """
-        with sqlite3.connect(self.db_name) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS tickers (
-                    symbol TEXT PRIMARY KEY,
-                    data TEXT,
-                    updated_at TEXT 
+        with self._conn:
+            self._migrate_legacy_schema()
+            self._migrate_rowid_layout()
+            self._conn.execute(self._CREATE_TABLE_SQL)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tickers_expires ON tickers(expires_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta "
+                "(key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID"
+            )
+
+    def _migrate_legacy_schema(self):
+        """Rebuild databases that still store rows as JSON blobs.
+
+        Earlier versions kept a `data` TEXT/BLOB column; its rows are decoded
+        once here and rewritten into the column-per-field layout.
+        """
+        cols = {row[1] for row in self._conn.execute("PRAGMA table_info(tickers)")}
+        if not cols or "data" not in cols:
+            return
+        # Databases from before the TTL rework have no expires_at column;
+        # carry their rows over as already expired (0) rather than crashing.
+        expires_expr = "expires_at" if "expires_at" in cols else "0"
+        legacy = self._conn.execute(
+            f"SELECT symbol, data, updated_at, {expires_expr} FROM tickers"
+        ).fetchall()
+        self._conn.execute("DROP TABLE tickers")
+        self._conn.execute(self._CREATE_TABLE_SQL)
+        rows = []
+        for symbol, data, updated_at, expires_at in legacy:
+            try:
+                item = json.loads(data)
+            except (ValueError, TypeError):
+                continue
+            rows.append(
+                (
+                    symbol,
+                    item.get("category"),
+                    item.get("name"),
+                    item.get("market_cap"),
+                    item.get("yahoo_lookup"),
+                    ",".join(item.get("alternatives") or []),
+                    updated_at,
+                    expires_at,
                 )
-            """
             )
+        if rows:
+            self._conn.executemany(self._UPSERT_SQL, rows)
+
+    def _migrate_rowid_layout(self):
+        """Rebuild fixed-column tables that predate the WITHOUT ROWID layout.
+
+        SQLite cannot alter a table's rowid-ness in place, so the old table
+        is renamed, a WITHOUT ROWID replacement is created, and the rows are
+        copied across.
+        """
+        row = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tickers'"
+        ).fetchone()
+        if row is None or "WITHOUT ROWID" in row[0].upper():
+            return
+        self._conn.execute("ALTER TABLE tickers RENAME TO tickers_rowid")
+        self._conn.execute(self._CREATE_TABLE_SQL)
+        self._conn.execute(
+            "INSERT INTO tickers SELECT symbol, category, name, market_cap, "
+            "yahoo_lookup, alternatives, updated_at, expires_at FROM tickers_rowid"
+        )
+        self._conn.execute("DROP TABLE tickers_rowid")
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        self._conn.close()
+
+    def __del__(self):
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+    def clear_mem(self):
+        """Drop all entries from the in-process LRU layer."""
+        with self._lock:
+            self._mem.clear()
+
+    @staticmethod
+    def _row_to_item(row) -> Dict[str, Any]:
+        """Unpack a tickers row tuple into a clean item dict."""
+        symbol, category, name, market_cap, yahoo_lookup, alternatives = row[:6]
+        return {
+            "category": category,
+            "ticker": symbol,
+            "name": name,
+            "market_cap": market_cap,
+            "yahoo_lookup": yahoo_lookup,
+            "alternatives": alternatives.split(",") if alternatives else [],
+        }
+
+    @staticmethod
+    def _hit(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Materialize a cache hit from a canonical item dict.
+
+        One dict construction: copying and tagging in a single unpack is
+        cheaper than a copy followed by a separate "source" insert. The
+        alternatives list is copied too — a shallow copy would alias the
+        list held by the LRU entry, letting callers mutate cached state.
+        """
+        return {
+            **item,
+            "alternatives": list(item["alternatives"]),
+            "source": "cache",
+        }
+
+    def _mem_get(self, symbol: str, now: int):
+        """Return a copy of a fresh LRU entry, or None on miss/expiry."""
+        entry = self._mem.get(symbol)
+        if entry is None:
+            return None
+        expires_at, item = entry
+        if expires_at <= now:
+            del self._mem[symbol]
+            return None
+        self._mem.move_to_end(symbol)
+        return self._hit(item)
+
+    def _mem_put(self, symbol: str, expires_at: int, item: Dict[str, Any]):
+        """Insert/refresh an LRU entry, evicting the oldest when full."""
+        self._mem[symbol] = (expires_at, item)
+        self._mem.move_to_end(symbol)
+        if len(self._mem) > _MEM_MAX:
+            self._mem.popitem(last=False)
 
     def get_many(self, symbols: List[str]) -> Dict[str, Any]:
         """Retrieve multiple cached ticker entries that are not expired.
@@ -48,24 +245,93 @@ class TickerCache:
         Returns
         -------
         dict[str, Any]
-            Mapping of symbol -> deserialized cache object. Each returned
-            object will have a `source` key set to `'cache'`.
+            Mapping of symbol -> cache item dict. Each returned item will
+            have a `source` key set to `'cache'`.
         """
         if not symbols:
             return {}
-        cutoff = (datetime.now() - timedelta(hours=self.hours_to_expire)).isoformat()
+        now = int(time.time())
         results = {}
 
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-            placeholders = ",".join("?" * len(symbols))
-            query = f"SELECT symbol, data FROM tickers WHERE symbol IN ({placeholders}) AND updated_at > ?"
-            cursor.execute(query, symbols + [cutoff])
-            for s, d in cursor.fetchall():
-                results[s] = json.loads(d)
-                results[s]["source"] = "cache"
+        with self._lock:
+            misses = []
+            for s in symbols:
+                hit = self._mem_get(s, now)
+                if hit is not None:
+                    results[s] = hit
+                else:
+                    misses.append(s)
+            if not misses:
+                return results
+
+            cursor = self._conn.cursor()
+            cursor.execute(self._SELECT_MANY_SQL, (json.dumps(misses), now))
+            for row in cursor.fetchall():
+                item = self._row_to_item(row)
+                self._mem_put(row[0], row[6], item)
+                results[row[0]] = self._hit(item)
         return results
 
+    def get_one(self, symbol: str):
+        """Retrieve a single cached ticker entry if it is not expired.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol to look up.
+
+        Returns
+        -------
+        dict or None
+            Cache item dict with `source` set to `'cache'`, or None on a
+            miss.
+        """
+        now = int(time.time())
+        with self._lock:
+            hit = self._mem_get(symbol, now)
+            if hit is not None:
+                return hit
+            row = self._conn.execute(self._SELECT_ONE_SQL, (symbol, now)).fetchone()
+            if row is None:
+                return None
+            item = self._row_to_item(row)
+            self._mem_put(symbol, row[6], item)
+            return self._hit(item)
+
+    def get_meta(self, key: str):
+        """Return the value stored under `key` in the meta table, or None.
+
+        Parameters
+        ----------
+        key : str
+            Meta key to look up.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        """Store a small string value under `key` in the meta table.
+
+        Parameters
+        ----------
+        key : str
+            Meta key to write.
+        value : str
+            Value to persist (callers serialize structured data themselves).
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def delete_meta(self, key: str):
+        """Remove `key` from the meta table if present."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+
     def save_many(self, items: Dict[str, Any]):
         """Save multiple items to the cache.
 
@@ -73,21 +339,42 @@ class TickerCache:
         ----------
         items : dict[str, Any]
             Mapping of symbol -> item dict. Items with `category == 'Unknown'`
-            are not persisted. The optional `source` key is stripped before
-            saving.
+            are persisted with the shorter negative-cache expiry. The optional
+            `source` key is ignored.
         """
         if not items:
             return
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-            now = datetime.now().isoformat()
-            data_tuples = []
+        now = int(time.time())
+        expires = now + self._expire_seconds
+        unknown_expires = now + self._unknown_expire_seconds
+        data_tuples = []
+        with self._lock:
             for s, d in items.items():
-                if d.get("category") != "Unknown":
-                    clean = {k: v for k, v in d.items() if k != "source"}
-                    data_tuples.append((s, json.dumps(clean), now))
-            if data_tuples:
-                cursor.executemany(
-                    "INSERT OR REPLACE INTO tickers (symbol, data, updated_at) VALUES (?, ?, ?)",
-                    data_tuples,
+                row_expires = (
+                    unknown_expires if d.get("category") == "Unknown" else expires
+                )
+                alternatives = list(d.get("alternatives") or [])
+                item = {
+                    "category": d.get("category"),
+                    "ticker": s,
+                    "name": d.get("name"),
+                    "market_cap": d.get("market_cap"),
+                    "yahoo_lookup": d.get("yahoo_lookup"),
+                    "alternatives": alternatives,
+                }
+                self._mem_put(s, row_expires, item)
+                data_tuples.append(
+                    (
+                        s,
+                        item["category"],
+                        item["name"],
+                        item["market_cap"],
+                        item["yahoo_lookup"],
+                        ",".join(alternatives),
+                        now,
+                        row_expires,
+                    )
                 )
+            # executemany handles an empty sequence cleanly, so no guard.
+            with self._conn:
+                self._conn.executemany(self._UPSERT_SQL, data_tuples)